@@ -0,0 +1,81 @@
+"""Cold-start benchmark for short-lived CRM workers.
+
+Spawns fresh interpreters and reports the median wall-clock time of:
+  - baseline:     the bare interpreter (``python -c pass``)
+  - import:       ``import crm``
+  - first call:   importing crm, building a CrmService and running one
+                  get_available_sites query against a seeded database
+
+Usage:
+    python bench_startup.py [--runs 20]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+from InitializeSQLiteDatabase import InitializeSQLiteDatabase
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+CASES = [
+    ("baseline", "pass"),
+    ("import", "import crm"),
+    ("first call", (
+        "import sys, crm\n"
+        "result = crm.CrmService(sys.argv[1]).get_available_sites(sys.argv[2], sys.argv[3])\n"
+        "assert result['status'] == 'success', result\n"
+    )),
+]
+
+def seed_database(db_file):
+    """Create the CRM schema with a few sites so the first call does real work."""
+    # The initializer reports each step on stdout; keep the benchmark output clean
+    with redirect_stdout(StringIO()):
+        initializer = InitializeSQLiteDatabase(db_file)
+        initializer.connect()
+        initializer.create_tables()
+        initializer.cursor.executemany(
+            "INSERT INTO rv_sites (site_number, site_type, daily_rate) VALUES (?, ?, ?)",
+            [(f"Site{i}", "Full Hookup", 50.0) for i in range(1, 51)]
+        )
+        initializer.conn.commit()
+        initializer.close()
+
+def time_case(code, args, runs):
+    """Return per-run wall-clock seconds for a fresh interpreter running code."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="interpreter launches per case")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_file = os.path.join(workdir, "bench_park.db")
+        seed_database(db_file)
+        check_in = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+        check_out = (datetime.now() + timedelta(days=33)).strftime("%Y-%m-%d")
+
+        baseline = None
+        print(f"{'case':<12} {'median ms':>10} {'min ms':>8} {'vs baseline':>12}")
+        for name, code in CASES:
+            timings = time_case(code, [db_file, check_in, check_out], options.runs)
+            median = statistics.median(timings)
+            if baseline is None:
+                baseline = median
+            print(f"{name:<12} {median * 1000:>10.1f} {min(timings) * 1000:>8.1f} {(median - baseline) * 1000:>+11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import sqlite3
+from sqlite3 import Error
+
+# Tables captured by the change feed, mapped to their integer primary key.
+TRACKED_TABLES = {
+    "customers": "customer_id",
+    "rv_sites": "site_id",
+    "reservations": "reservation_id",
+    "invoices": "invoice_id",
+    "payments": "payment_id",
+    "facilities": "facility_id",
+    "assets": "asset_id",
+    "maintenance_requests": "request_id",
+    "maintenance_schedules": "schedule_id",
+    "maintenance_logs": "log_id",
+}
+
+class InitializeChangeCaptureDatabase:
+    def __init__(self, db_file="park.db"):
+        """Initialize the database connection."""
+        self.db_file = db_file
+        self.conn = None
+        self.cursor = None
+
+    def connect(self):
+        """Create a database connection to the SQLite database."""
+        try:
+            self.conn = sqlite3.connect(self.db_file)
+            self.cursor = self.conn.cursor()
+            print(f"Connected to SQLite database: {self.db_file}")
+        except Error as e:
+            print(f"Error connecting to database: {e}")
+            raise
+
+    def create_tables(self):
+        """Create the change log and consumer position tables if they do not exist."""
+        try:
+            # Append-only change log; AUTOINCREMENT keeps change_id monotonic after compaction
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS change_log (
+                    change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    table_name TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    row_id INTEGER NOT NULL,
+                    row_data TEXT,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    CHECK (operation IN ('INSERT', 'UPDATE', 'DELETE'))
+                )
+            """)
+
+            # Table for consumer cursors (last acknowledged change per consumer)
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS change_consumers (
+                    consumer_name TEXT PRIMARY KEY,
+                    last_change_id INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            self.conn.commit()
+            print("Change capture tables created successfully or already exist.")
+        except Error as e:
+            print(f"Error creating change capture tables: {e}")
+            raise
+
+    def create_triggers(self):
+        """(Re)create capture triggers for every tracked table present in the database.
+
+        Triggers are dropped and rebuilt so that re-running the initializer after
+        a schema change (or after the maintenance tables are added) picks up the
+        current column list.
+        """
+        try:
+            for table, primary_key in TRACKED_TABLES.items():
+                self.cursor.execute(f"PRAGMA table_info({table})")
+                columns = [row[1] for row in self.cursor.fetchall()]
+                if not columns:
+                    print(f"Skipping change capture for missing table: {table}")
+                    continue
+                for operation, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                    trigger = f"cdc_{table}_{operation.lower()}"
+                    row_data = ", ".join(f"'{column}', {row}.{column}" for column in columns)
+                    self.cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                    self.cursor.execute(f"""
+                        CREATE TRIGGER {trigger} AFTER {operation} ON {table}
+                        BEGIN
+                            INSERT INTO change_log (table_name, operation, row_id, row_data)
+                            VALUES ('{table}', '{operation}', {row}.{primary_key}, json_object({row_data}));
+                        END
+                    """)
+            self.conn.commit()
+            print("Change capture triggers created successfully.")
+        except Error as e:
+            print(f"Error creating change capture triggers: {e}")
+            raise
+
+    def close(self):
+        """Close the database connection."""
+        if self.cursor:
+            self.cursor.close()
+        if self.conn:
+            self.conn.close()
+            print("Database connection closed.")
+
+    def initialize(self):
+        """Connect to the database and create change capture tables and triggers."""
+        try:
+            self.connect()
+            self.create_tables()
+            self.create_triggers()
+        finally:
+            self.close()
+
+if __name__ == "__main__":
+    # Example usage
+    db_initializer = InitializeChangeCaptureDatabase()
+    db_initializer.initialize()
@@ -0,0 +1,26 @@
+"""Change-data-capture feed over park.db.
+
+Run InitializeChangeCaptureDatabase after the CRM and maintenance initializers
+to install the change log and its triggers, then read deltas with ChangeFeed.
+"""
+
+import importlib
+
+_SUBMODULES = {
+    "ChangeFeed": "cdc_ChangeFeed",
+    "InitializeChangeCaptureDatabase": "InitializeChangeCaptureDatabase",
+}
+
+__all__ = list(_SUBMODULES)
+
+def __getattr__(name):
+    """Import the submodule defining ``name`` the first time it is requested."""
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_SUBMODULES[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,151 @@
+import json
+import sqlite3
+from sqlite3 import Error
+
+class ChangeFeed:
+    """Cursor-based reader over the change_log table.
+
+    Each downstream consumer (e.g. accounting, channel manager) is registered by
+    name and has a last acknowledged change_id. poll() returns the next batch of
+    changes after that position using a primary-key range scan, so the cost of a
+    poll depends on how much changed, not on the size of the source tables.
+    acknowledge() advances the position once the consumer has applied a batch,
+    and compact() deletes entries every registered consumer has acknowledged.
+    """
+
+    def __init__(self, db_file="park.db", batch_size=500):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.conn = None
+        self.cursor = None
+
+    def connect(self):
+        """Establish a connection to the SQLite database if not already set."""
+        if self.conn is None or self.cursor is None:
+            try:
+                self.conn = sqlite3.connect(self.db_file)
+                self.cursor = self.conn.cursor()
+            except Error as e:
+                raise Exception(f"Database connection failed: {e}")
+
+    def close(self):
+        """Close the database connection if it exists."""
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def read_changes(self, since_change_id=0, limit=None):
+        """Return up to limit changes with change_id greater than since_change_id, oldest first."""
+        try:
+            self.connect()
+            self.cursor.execute("""
+                SELECT change_id, table_name, operation, row_id, row_data, changed_at
+                FROM change_log
+                WHERE change_id > ?
+                ORDER BY change_id
+                LIMIT ?
+            """, (since_change_id, limit or self.batch_size))
+            return [
+                {
+                    "change_id": change_id,
+                    "table_name": table_name,
+                    "operation": operation,
+                    "row_id": row_id,
+                    "row_data": json.loads(row_data) if row_data is not None else None,
+                    "changed_at": changed_at,
+                }
+                for change_id, table_name, operation, row_id, row_data, changed_at in self.cursor.fetchall()
+            ]
+        except Error as e:
+            raise Exception(f"Failed to read changes: {e}")
+
+    def latest_change_id(self):
+        """Return the highest change_id ever assigned, or 0 if none."""
+        try:
+            self.connect()
+            self.cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")
+            row = self.cursor.fetchone()
+            return row[0] if row else 0
+        except Error as e:
+            raise Exception(f"Failed to read latest change id: {e}")
+
+    def register_consumer(self, consumer_name, from_latest=False):
+        """Register a consumer; existing consumers keep their position.
+
+        New consumers start at the beginning of the retained log, or at the
+        current head when from_latest is True (e.g. after taking a full snapshot).
+        """
+        try:
+            self.connect()
+            start = self.latest_change_id() if from_latest else 0
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO change_consumers (consumer_name, last_change_id)
+                VALUES (?, ?)
+            """, (consumer_name, start))
+            self.conn.commit()
+            return self.get_position(consumer_name)
+        except Error as e:
+            raise Exception(f"Failed to register consumer: {e}")
+
+    def remove_consumer(self, consumer_name):
+        """Drop a consumer so its position no longer holds back compaction."""
+        try:
+            self.connect()
+            self.cursor.execute("DELETE FROM change_consumers WHERE consumer_name = ?", (consumer_name,))
+            self.conn.commit()
+        except Error as e:
+            raise Exception(f"Failed to remove consumer: {e}")
+
+    def get_position(self, consumer_name):
+        """Return the last change_id acknowledged by a consumer."""
+        try:
+            self.connect()
+            self.cursor.execute("SELECT last_change_id FROM change_consumers WHERE consumer_name = ?", (consumer_name,))
+            row = self.cursor.fetchone()
+        except Error as e:
+            raise Exception(f"Failed to read consumer position: {e}")
+        if row is None:
+            raise ValueError(f"Unknown consumer: {consumer_name}")
+        return row[0]
+
+    def poll(self, consumer_name, limit=None):
+        """Return the next batch of changes after the consumer's acknowledged position."""
+        return self.read_changes(self.get_position(consumer_name), limit)
+
+    def acknowledge(self, consumer_name, change_id):
+        """Advance a consumer's position to change_id; positions never move backwards.
+
+        Acknowledging past the latest assigned change_id is rejected: it would
+        make the consumer silently skip changes that have not been written yet.
+        """
+        try:
+            self.connect()
+            latest = self.latest_change_id()
+            if change_id > latest:
+                raise ValueError(f"Cannot acknowledge change {change_id}: latest change is {latest}")
+            self.cursor.execute("""
+                UPDATE change_consumers
+                SET last_change_id = MAX(last_change_id, ?), updated_at = CURRENT_TIMESTAMP
+                WHERE consumer_name = ?
+            """, (change_id, consumer_name))
+            if self.cursor.rowcount == 0:
+                raise ValueError(f"Unknown consumer: {consumer_name}")
+            self.conn.commit()
+        except Error as e:
+            raise Exception(f"Failed to acknowledge changes: {e}")
+
+    def compact(self):
+        """Delete changes acknowledged by every registered consumer; return the number removed."""
+        try:
+            self.connect()
+            self.cursor.execute("""
+                DELETE FROM change_log
+                WHERE change_id <= (SELECT MIN(last_change_id) FROM change_consumers)
+            """)
+            self.conn.commit()
+            return self.cursor.rowcount
+        except Error as e:
+            raise Exception(f"Failed to compact change log: {e}")
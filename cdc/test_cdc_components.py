@@ -0,0 +1,127 @@
+import unittest
+import sqlite3
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+from InitializeChangeCaptureDatabase import InitializeChangeCaptureDatabase
+from cdc_ChangeFeed import ChangeFeed
+
+class TestCdcComponents(unittest.TestCase):
+    def setUp(self):
+        """Create a file-based database with CRM tables and change capture installed."""
+        self.db_file = "test_cdc_park.db"
+        self.conn = sqlite3.connect(self.db_file)
+        self.cursor = self.conn.cursor()
+        self.cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS customers (
+                customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                first_name TEXT NOT NULL,
+                last_name TEXT NOT NULL,
+                email TEXT UNIQUE,
+                phone TEXT,
+                address TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS invoices (
+                invoice_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                reservation_id INTEGER NOT NULL,
+                customer_id INTEGER NOT NULL,
+                issue_date DATE NOT NULL,
+                due_date DATE NOT NULL,
+                total_amount REAL NOT NULL,
+                status TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        self.conn.commit()
+        with redirect_stdout(StringIO()):
+            InitializeChangeCaptureDatabase(self.db_file).initialize()
+        self.feed = ChangeFeed(self.db_file, batch_size=2)
+
+    def tearDown(self):
+        """Close connections and remove the test database file."""
+        self.feed.close()
+        self.conn.close()
+        if os.path.exists(self.db_file):
+            os.remove(self.db_file)
+
+    def add_customer(self, email):
+        self.cursor.execute(
+            "INSERT INTO customers (first_name, last_name, email) VALUES (?, ?, ?)", ("John", "Doe", email))
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def test_triggers_capture_insert_update_delete(self):
+        """Test that inserts, updates and deletes are appended to the change log."""
+        customer_id = self.add_customer("john.doe@example.com")
+        self.cursor.execute("UPDATE customers SET phone = ? WHERE customer_id = ?", ("+12345678901", customer_id))
+        self.cursor.execute("DELETE FROM customers WHERE customer_id = ?", (customer_id,))
+        self.conn.commit()
+        changes = self.feed.read_changes(0, limit=10)
+        self.assertEqual([c["operation"] for c in changes], ["INSERT", "UPDATE", "DELETE"])
+        self.assertTrue(all(c["table_name"] == "customers" and c["row_id"] == customer_id for c in changes))
+        self.assertEqual(changes[1]["row_data"]["phone"], "+12345678901")
+        self.assertEqual(changes[2]["row_data"]["email"], "john.doe@example.com")
+
+    def test_initialize_is_idempotent(self):
+        """Test that re-running the initializer does not duplicate triggers."""
+        with redirect_stdout(StringIO()):
+            InitializeChangeCaptureDatabase(self.db_file).initialize()
+        self.add_customer("john.doe@example.com")
+        self.assertEqual(len(self.feed.read_changes(0, limit=10)), 1)
+
+    def test_poll_and_acknowledge_in_batches(self):
+        """Test that a consumer reads deltas in batches from its acknowledged position."""
+        for i in range(3):
+            self.add_customer(f"customer{i}@example.com")
+        self.assertEqual(self.feed.register_consumer("accounting"), 0)
+        first = self.feed.poll("accounting")
+        self.assertEqual(len(first), 2)
+        self.feed.acknowledge("accounting", first[-1]["change_id"])
+        second = self.feed.poll("accounting")
+        self.assertEqual(len(second), 1)
+        self.assertGreater(second[0]["change_id"], first[-1]["change_id"])
+        self.feed.acknowledge("accounting", first[0]["change_id"])
+        self.assertEqual(self.feed.get_position("accounting"), first[-1]["change_id"])
+
+    def test_acknowledge_beyond_latest_change(self):
+        """Test that a consumer cannot acknowledge changes that do not exist yet."""
+        self.add_customer("john.doe@example.com")
+        self.feed.register_consumer("accounting")
+        latest = self.feed.latest_change_id()
+        with self.assertRaises(ValueError):
+            self.feed.acknowledge("accounting", latest + 1)
+        self.assertEqual(self.feed.get_position("accounting"), 0)
+        self.add_customer("jane.doe@example.com")
+        self.assertEqual(len(self.feed.poll("accounting")), 2)
+
+    def test_register_consumer_from_latest(self):
+        """Test that a consumer registered from the latest change skips history."""
+        self.add_customer("john.doe@example.com")
+        self.feed.register_consumer("channel_manager", from_latest=True)
+        self.assertEqual(self.feed.poll("channel_manager"), [])
+
+    def test_unknown_consumer(self):
+        """Test polling with an unregistered consumer."""
+        with self.assertRaises(ValueError):
+            self.feed.poll("missing")
+
+    def test_compact_keeps_unacknowledged_changes(self):
+        """Test that compaction only removes changes every consumer has acknowledged."""
+        for i in range(3):
+            self.add_customer(f"customer{i}@example.com")
+        self.feed.register_consumer("accounting")
+        self.feed.register_consumer("channel_manager")
+        changes = self.feed.read_changes(0, limit=10)
+        self.feed.acknowledge("accounting", changes[2]["change_id"])
+        self.feed.acknowledge("channel_manager", changes[0]["change_id"])
+        self.assertEqual(self.feed.compact(), 1)
+        self.feed.remove_consumer("channel_manager")
+        self.assertEqual(self.feed.compact(), 2)
+        self.add_customer("late@example.com")
+        remaining = self.feed.read_changes(0, limit=10)
+        self.assertEqual(len(remaining), 1)
+        self.assertGreater(remaining[0]["change_id"], changes[2]["change_id"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+"""RV Park CRM package.
+
+Submodules are loaded lazily on first attribute access, so ``import crm``
+costs almost nothing and one-shot jobs only import what they use::
+
+    import crm
+    service = crm.CrmService("park.db")
+"""
+
+import importlib
+
+_SUBMODULES = {
+    "CrmDatabase": "crm_CrmDatabase",
+    "CrmErrorHandler": "crm_CrmErrorHandler",
+    "CrmService": "crm_CrmService",
+    "CrmValidator": "crm_CrmValidator",
+    "CrmWriteQueue": "crm_CrmWriteQueue",
+}
+
+__all__ = list(_SUBMODULES)
+
+def __getattr__(name):
+    """Import the submodule defining ``name`` the first time it is requested."""
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_SUBMODULES[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
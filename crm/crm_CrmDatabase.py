@@ -2,6 +2,11 @@ import sqlite3
 from sqlite3 import Error
 from datetime import datetime
 
+CRM_TABLES = ("customers", "rv_sites", "reservations", "invoices", "payments")
+
+# Database files whose schema has already been checked in this process.
+_checked_schemas = set()
+
 class CrmDatabase:
     """Handles all SQLite database interactions for the CRM."""
     
@@ -18,6 +23,25 @@ class CrmDatabase:
                 self.cursor = self.conn.cursor()
             except Error as e:
                 raise Exception(f"Database connection failed: {e}")
+            try:
+                self.check_schema()
+            except Exception:
+                self.close()
+                raise
+
+    def check_schema(self):
+        """Verify the CRM tables exist, once per database file per process."""
+        if self.db_file in _checked_schemas:
+            return
+        try:
+            self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            existing = {row[0] for row in self.cursor.fetchall()}
+        except Error as e:
+            raise Exception(f"Schema check failed: {e}")
+        missing = [table for table in CRM_TABLES if table not in existing]
+        if missing:
+            raise Exception(f"Schema check failed: missing tables {', '.join(missing)}")
+        _checked_schemas.add(self.db_file)
 
     def close(self):
         """Close the database connection if it exists."""
@@ -28,7 +52,7 @@ class CrmDatabase:
             self.conn.close()
             self.conn = None
 
-    def add_customer(self, first_name, last_name, email, phone, address):
+    def add_customer(self, first_name, last_name, email, phone, address, commit=True):
         """Add a new customer to the database."""
         try:
             self.connect()
@@ -36,7 +60,8 @@ class CrmDatabase:
                 INSERT INTO customers (first_name, last_name, email, phone, address)
                 VALUES (?, ?, ?, ?, ?)
             """, (first_name, last_name, email, phone, address))
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return self.cursor.lastrowid
         except Error as e:
             raise Exception(f"Failed to add customer: {e}")
@@ -52,7 +77,7 @@ class CrmDatabase:
             raise Exception(f"Failed to retrieve customer: {e}")
         # Do not close connection in tests
 
-    def add_reservation(self, customer_id, site_id, check_in_date, check_out_date, status, total_amount):
+    def add_reservation(self, customer_id, site_id, check_in_date, check_out_date, status, total_amount, commit=True):
         """Add a new reservation to the database."""
         try:
             self.connect()
@@ -60,7 +85,8 @@ class CrmDatabase:
                 INSERT INTO reservations (customer_id, site_id, check_in_date, check_out_date, status, total_amount)
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (customer_id, site_id, check_in_date, check_out_date, status, total_amount))
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return self.cursor.lastrowid
         except Error as e:
             raise Exception(f"Failed to add reservation: {e}")
@@ -86,7 +112,7 @@ class CrmDatabase:
             raise Exception(f"Failed to retrieve available sites: {e}")
         # Do not close connection in tests
 
-    def add_invoice(self, reservation_id, customer_id, issue_date, due_date, total_amount, status):
+    def add_invoice(self, reservation_id, customer_id, issue_date, due_date, total_amount, status, commit=True):
         """Add a new invoice to the database."""
         try:
             self.connect()
@@ -94,13 +120,14 @@ class CrmDatabase:
                 INSERT INTO invoices (reservation_id, customer_id, issue_date, due_date, total_amount, status)
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (reservation_id, customer_id, issue_date, due_date, total_amount, status))
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return self.cursor.lastrowid
         except Error as e:
             raise Exception(f"Failed to add invoice: {e}")
         # Do not close connection in tests
 
-    def add_payment(self, invoice_id, customer_id, payment_date, amount, payment_method):
+    def add_payment(self, invoice_id, customer_id, payment_date, amount, payment_method, commit=True):
         """Add a new payment to the database."""
         try:
             self.connect()
@@ -108,7 +135,8 @@ class CrmDatabase:
                 INSERT INTO payments (invoice_id, customer_id, payment_date, amount, payment_method)
                 VALUES (?, ?, ?, ?, ?)
             """, (invoice_id, customer_id, payment_date, amount, payment_method))
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return self.cursor.lastrowid
         except Error as e:
             raise Exception(f"Failed to add payment: {e}")
@@ -1,17 +1,27 @@
-import logging
+_logger = None
 
-class CrmErrorHandler:
-    """Centralizes error handling and logging for the CRM."""
-    
-    def __init__(self):
+def _get_logger():
+    """Configure error logging once per process, on the first error.
+
+    logging is imported here rather than at module level so that jobs which
+    never hit an error do not pay for it at startup.
+    """
+    global _logger
+    if _logger is None:
+        import logging
         logging.basicConfig(filename='crm_errors.log', level=logging.ERROR,
                            format='%(asctime)s - %(levelname)s - %(message)s')
+        _logger = logging.getLogger()
+    return _logger
+
+class CrmErrorHandler:
+    """Centralizes error handling and logging for the CRM."""
 
     def handle_error(self, exception, context):
         """Handle and log errors, returning a standardized error response."""
         error_message = f"{context}: {str(exception)}"
-        logging.error(error_message)
+        _get_logger().error(error_message)
         return {
             "status": "error",
             "message": error_message
-        }
\ No newline at end of file
+        }
@@ -1,20 +1,80 @@
 from datetime import datetime, timedelta
-from crm_CrmDatabase import CrmDatabase
-from crm_CrmValidator import CrmValidator
-from crm_CrmErrorHandler import CrmErrorHandler
+try:
+    from .crm_CrmDatabase import CrmDatabase
+    from .crm_CrmValidator import CrmValidator
+    from .crm_CrmErrorHandler import CrmErrorHandler
+except ImportError:
+    from crm_CrmDatabase import CrmDatabase
+    from crm_CrmValidator import CrmValidator
+    from crm_CrmErrorHandler import CrmErrorHandler
+
+# Both helpers are stateless, so every CrmService shares one instance of each.
+_validator = CrmValidator()
+_error_handler = CrmErrorHandler()
 
 class CrmService:
-    """Handles business logic for CRM operations."""
+    """Handles business logic for CRM operations.
+
+    With write_behind=True, validated mutations are handed to a CrmWriteQueue
+    and group-committed by its writer thread. Those calls return
+    {"status": "queued", ...} with a Future in place of each id; call flush()
+    to force a commit before reading the ids back.
+    """
     
-    def __init__(self, db_file="park.db"):
+    def __init__(self, db_file="park.db", write_behind=False, max_batch_size=100, max_latency=0.05):
         self.db = CrmDatabase(db_file)
-        self.validator = CrmValidator()
-        self.error_handler = CrmErrorHandler()
+        self.validator = _validator
+        self.error_handler = _error_handler
+        self.write_queue = None
+        if write_behind:
+            # Imported here so one-shot jobs never pay for threading/futures.
+            try:
+                from .crm_CrmWriteQueue import CrmWriteQueue
+            except ImportError:
+                from crm_CrmWriteQueue import CrmWriteQueue
+            self.write_queue = CrmWriteQueue(db_file, max_batch_size, max_latency)
+
+    def flush(self, timeout=None):
+        """Commit all queued writes and wait until they are durable."""
+        if self.write_queue:
+            self.write_queue.flush(timeout)
+
+    def close(self):
+        """Commit queued writes, stop the writer and close the database connection."""
+        if self.write_queue:
+            self.write_queue.close()
+        self.db.close()
+
+    def _submit(self, operation, context, *keys):
+        """Queue a write and return one Future per id produced by the operation."""
+        from concurrent.futures import Future
+        batch_future = self.write_queue.submit(operation)
+        id_futures = {key: Future() for key in keys}
+
+        def resolve(done):
+            error = done.exception()
+            if error is not None:
+                self.error_handler.handle_error(error, context)
+                for future in id_futures.values():
+                    future.set_exception(error)
+                return
+            result = done.result()
+            if len(keys) == 1:
+                result = (result,)
+            for key, value in zip(keys, result):
+                id_futures[key].set_result(value)
+
+        batch_future.add_done_callback(resolve)
+        return {"status": "queued", **id_futures}
 
     def create_customer(self, first_name, last_name, email, phone, address):
         """Create a new customer after validation."""
         try:
             self.validator.validate_customer_data(first_name, last_name, email, phone, address)
+            if self.write_queue:
+                return self._submit(
+                    lambda db: db.add_customer(first_name, last_name, email, phone, address, commit=False),
+                    "Failed to create customer", "customer_id")
             customer_id = self.db.add_customer(first_name, last_name, email, phone, address)
             return {"status": "success", "customer_id": customer_id}
         except Exception as e:
@@ -24,9 +84,13 @@ class CrmService:
         """Create a reservation with calculated cost."""
         try:
             self.validator.validate_reservation_data(customer_id, site_id, check_in_date, check_out_date)
-            check_in = datetime.strptime(check_in_date, "%Y-%m-%d")
-            check_out = datetime.strptime(check_out_date, "%Y-%m-%d")
+            check_in = self.validator.parse_date(check_in_date)
+            check_out = self.validator.parse_date(check_out_date)
             days = (check_out - check_in).days
+            if self.write_queue:
+                return self._submit(
+                    lambda db: self._write_reservation(db, customer_id, site_id, check_in_date, check_out_date, days),
+                    "Failed to create reservation", "reservation_id", "invoice_id")
             
             # Get site details to calculate cost
             self.db.connect()
@@ -51,6 +115,10 @@ class CrmService:
         try:
             self.validator.validate_payment_data(invoice_id, customer_id, amount, payment_method)
             payment_date = datetime.now().strftime("%Y-%m-%d")
+            if self.write_queue:
+                return self._submit(
+                    lambda db: self._write_payment(db, invoice_id, customer_id, payment_date, amount, payment_method),
+                    "Failed to record payment", "payment_id")
             payment_id = self.db.add_payment(invoice_id, customer_id, payment_date, amount, payment_method)
             
             # Update invoice status
@@ -63,6 +131,25 @@ class CrmService:
         except Exception as e:
             return self.error_handler.handle_error(e, "Failed to record payment")
 
+    def _write_reservation(self, db, customer_id, site_id, check_in_date, check_out_date, days):
+        """Insert a reservation and its invoice inside the writer's open transaction."""
+        db.cursor.execute("SELECT daily_rate FROM rv_sites WHERE site_id = ?", (site_id,))
+        row = db.cursor.fetchone()
+        if row is None:
+            raise ValueError("Invalid site ID")
+        total_amount = row[0] * days
+        reservation_id = db.add_reservation(customer_id, site_id, check_in_date, check_out_date, "Confirmed", total_amount, commit=False)
+        issue_date = datetime.now().strftime("%Y-%m-%d")
+        due_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+        invoice_id = db.add_invoice(reservation_id, customer_id, issue_date, due_date, total_amount, "Pending", commit=False)
+        return reservation_id, invoice_id
+
+    def _write_payment(self, db, invoice_id, customer_id, payment_date, amount, payment_method):
+        """Insert a payment and mark its invoice paid inside the writer's open transaction."""
+        payment_id = db.add_payment(invoice_id, customer_id, payment_date, amount, payment_method, commit=False)
+        db.cursor.execute("UPDATE invoices SET status = 'Paid' WHERE invoice_id = ?", (invoice_id,))
+        return payment_id
+
     def get_available_sites(self, check_in_date, check_out_date):
         """Get available sites for a date range."""
         try:
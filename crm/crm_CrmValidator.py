@@ -1,5 +1,14 @@
 from datetime import datetime
-import re
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def _patterns():
+    """Compile the email and phone patterns once, on first use.
+
+    re is imported lazily because most one-shot jobs never validate a customer.
+    """
+    import re
+    return re.compile(r"[^@]+@[^@]+\.[^@]+"), re.compile(r"^\+?\d{10,15}$")
 
 class CrmValidator:
     """Validates input data for CRM operations."""
@@ -10,9 +19,10 @@ class CrmValidator:
             raise ValueError("First name is required and must be a non-empty string")
         if not last_name or not isinstance(last_name, str) or len(last_name.strip()) == 0:
             raise ValueError("Last name is required and must be a non-empty string")
-        if email and not re.match(r"[^@]+@[^@]+\.[^@]+", email):
+        email_pattern, phone_pattern = _patterns()
+        if email and not email_pattern.match(email):
             raise ValueError("Invalid email format")
-        if phone and not re.match(r"^\+?\d{10,15}$", phone):
+        if phone and not phone_pattern.match(phone):
             raise ValueError("Invalid phone number format")
 
     def validate_reservation_data(self, customer_id, site_id, check_in_date, check_out_date):
@@ -36,14 +46,26 @@ class CrmValidator:
 
     def validate_date_range(self, check_in_date, check_out_date):
         """Validate date range for reservations."""
+        check_in = self.parse_date(check_in_date)
+        check_out = self.parse_date(check_out_date)
+        if check_in >= check_out:
+            raise ValueError("Check-out date must be after check-in date")
+        if check_in < datetime.now().replace(hour=0, minute=0, second=0, microsecond=0):
+            raise ValueError("Check-in date cannot be in the past")
+
+    @staticmethod
+    def parse_date(value):
+        """Parse a YYYY-MM-DD string into a datetime at midnight.
+
+        Stricter than datetime.strptime(value, "%Y-%m-%d"): months and days
+        must be zero-padded, so "2030-6-1" is rejected. Avoids importing
+        _strptime, which pulls in re and locale on every cold start.
+        """
+        if (not isinstance(value, str) or len(value) != 10 or value[4] != "-" or value[7] != "-"
+                or not value[:4].isdigit() or not value[5:7].isdigit() or not value[8:].isdigit()
+                or not value.isascii()):
+            raise ValueError("Dates must be in YYYY-MM-DD format")
         try:
-            check_in = datetime.strptime(check_in_date, "%Y-%m-%d")
-            check_out = datetime.strptime(check_out_date, "%Y-%m-%d")
-            if check_in >= check_out:
-                raise ValueError("Check-out date must be after check-in date")
-            if check_in < datetime.now().replace(hour=0, minute=0, second=0, microsecond=0):
-                raise ValueError("Check-in date cannot be in the past")
-        except ValueError as e:
-            if "strptime" in str(e):
-                raise ValueError("Dates must be in YYYY-MM-DD format")
-            raise
\ No newline at end of file
+            return datetime(int(value[:4]), int(value[5:7]), int(value[8:]))
+        except ValueError:
+            raise ValueError("Dates must be in YYYY-MM-DD format")
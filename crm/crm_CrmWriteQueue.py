@@ -0,0 +1,187 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+try:
+    from .crm_CrmDatabase import CrmDatabase
+except ImportError:
+    from crm_CrmDatabase import CrmDatabase
+
+# Queues still open at interpreter exit; each is closed (and its writes committed) by the hook below.
+_live_queues = weakref.WeakSet()
+
+@atexit.register
+def _close_live_queues():
+    """Commit queued writes of any queue the caller forgot to close before exiting."""
+    for write_queue in list(_live_queues):
+        write_queue.close()
+
+class CrmWriteQueue:
+    """Write-behind queue that group-commits CRM mutations from a single writer thread.
+
+    Each submitted operation is a callable that receives the writer's
+    CrmDatabase and performs its inserts/updates with commit=False. The writer
+    drains the queue into one transaction per batch. A batch takes everything
+    already waiting (up to max_batch_size) and then closes once max_latency
+    seconds have passed since its first operation was submitted, so a backlog
+    built up during the previous commit goes out together. Every operation
+    runs inside its own savepoint, so a failing operation is rolled back
+    without aborting the rest of its batch.
+    Futures are resolved only after the batch has been committed. Queues that
+    are still open at interpreter exit are closed by an atexit hook, so queued
+    writes are committed even if the caller never calls close().
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_file="park.db", max_batch_size=100, max_latency=0.05):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_latency < 0:
+            raise ValueError("max_latency cannot be negative")
+        self.db_file = db_file
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._queue = queue.Queue()
+        self._closed = False
+        self._error = None
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name="CrmWriteQueue", daemon=True)
+        self._writer.start()
+        _live_queues.add(self)
+
+    def submit(self, operation):
+        """Queue an operation and return a Future for its result."""
+        future = Future()
+        with self._lock:
+            self._check_writer()
+            if self._closed:
+                raise RuntimeError("Write queue is closed")
+            self._queue.put((operation, future, time.monotonic()))
+        return future
+
+    def flush(self, timeout=None):
+        """Force a commit of everything queued so far and wait until it is durable."""
+        marker = Future()
+        with self._lock:
+            self._check_writer()
+            if self._closed:
+                return
+            self._queue.put((None, marker, time.monotonic()))
+        marker.result(timeout)
+
+    def close(self, timeout=None):
+        """Commit pending operations and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((self._STOP, None, time.monotonic()))
+        self._writer.join(timeout)
+
+    def _check_writer(self):
+        """Raise if the writer thread has died; callers must hold self._lock."""
+        if self._error is not None:
+            raise RuntimeError(f"Write queue writer failed: {self._error}")
+        if not self._closed and not self._writer.is_alive():
+            raise RuntimeError("Write queue writer is not running")
+
+    def _run(self):
+        """Writer loop: collect a batch, commit it, resolve its futures.
+
+        Any error escaping the loop (e.g. the connection cannot be opened or a
+        ROLLBACK fails) is fatal: the queue is closed and every pending future,
+        including the batch in flight, fails instead of waiting forever.
+        """
+        db = CrmDatabase(self.db_file)
+        batch = []
+        try:
+            db.conn = sqlite3.connect(self.db_file, isolation_level=None)
+            db.cursor = db.conn.cursor()
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                deadline = batch[0][2] + self.max_latency
+                while self._collecting(batch) and len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except queue.Empty:
+                        pass
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                stopping = batch[-1][0] is self._STOP
+                self._commit_batch(db, batch)
+                batch = []
+        except Exception as e:
+            self._fail(e, batch)
+        finally:
+            try:
+                db.close()
+            except Exception:
+                pass
+
+    def _fail(self, error, batch):
+        """Close the queue after a fatal writer error and fail every unresolved future."""
+        with self._lock:
+            self._closed = True
+            self._error = error
+        pending = list(batch)
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        failure = Exception(f"Write queue writer failed: {error}")
+        for operation, future, _ in pending:
+            if future is not None and not future.done():
+                future.set_exception(failure)
+
+    def _collecting(self, batch):
+        """A flush marker or stop request ends the current batch immediately."""
+        operation = batch[-1][0]
+        return operation is not None and operation is not self._STOP
+
+    def _commit_batch(self, db, batch):
+        """Run a batch in one transaction, isolating each operation in a savepoint."""
+        results = []
+        try:
+            db.cursor.execute("BEGIN IMMEDIATE")
+            for operation, future, _ in batch:
+                if operation is None or operation is self._STOP:
+                    continue
+                if not future.set_running_or_notify_cancel():
+                    continue
+                db.cursor.execute("SAVEPOINT crm_op")
+                try:
+                    results.append((future, operation(db), None))
+                    db.cursor.execute("RELEASE crm_op")
+                except Exception as e:
+                    db.cursor.execute("ROLLBACK TO crm_op")
+                    db.cursor.execute("RELEASE crm_op")
+                    results.append((future, None, e))
+            db.cursor.execute("COMMIT")
+        except Exception as e:
+            if db.conn.in_transaction:
+                db.cursor.execute("ROLLBACK")
+            error = Exception(f"Failed to commit write batch: {e}")
+            for operation, future, _ in batch:
+                if future is not None and not future.done():
+                    future.set_exception(error)
+            return
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        for operation, future, _ in batch:
+            if operation is None:
+                future.set_result(None)
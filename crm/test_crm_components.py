@@ -1,12 +1,16 @@
 import unittest
 import sqlite3
 import os
+import subprocess
+import sys
+import threading
 from datetime import datetime, timedelta
 from unittest.mock import patch
 from crm_CrmDatabase import CrmDatabase
 from crm_CrmService import CrmService
 from crm_CrmValidator import CrmValidator
 from crm_CrmErrorHandler import CrmErrorHandler
+from crm_CrmWriteQueue import CrmWriteQueue
 
 class TestCrmComponents(unittest.TestCase):
     def setUp(self):
@@ -214,6 +218,87 @@ class TestCrmComponents(unittest.TestCase):
         self.assertEqual(len(result["sites"]), 1)
         self.assertEqual(result["sites"][0][1], "Site2")
 
+    def test_write_behind_record_payment(self):
+        """Test that a queued payment and its invoice update are committed on flush."""
+        customer_id = self.db.add_customer("John", "Doe", "john.doe@example.com", "+12345678901", "123 Main St")
+        reservation_id = self.db.add_reservation(customer_id, 1, "2025-06-01", "2025-06-05", "Confirmed", 200.0)
+        invoice_id = self.db.add_invoice(reservation_id, customer_id, "2025-05-18", "2025-05-25", 200.0, "Pending")
+        service = CrmService(self.db_file, write_behind=True, max_batch_size=50, max_latency=10)
+        try:
+            result = service.record_payment(invoice_id, customer_id, 200.0, "Credit Card")
+            self.assertEqual(result["status"], "queued")
+            service.flush(timeout=5)
+            payment_id = result["payment_id"].result(timeout=5)
+        finally:
+            service.close()
+        self.cursor.execute("SELECT invoice_id, amount FROM payments WHERE payment_id = ?", (payment_id,))
+        self.assertEqual(self.cursor.fetchone(), (invoice_id, 200.0))
+        self.cursor.execute("SELECT status FROM invoices WHERE invoice_id = ?", (invoice_id,))
+        self.assertEqual(self.cursor.fetchone()[0], "Paid")
+
+    def test_write_behind_failure_isolated_in_batch(self):
+        """Test that a failing queued write does not roll back the rest of its batch."""
+        service = CrmService(self.db_file, write_behind=True, max_batch_size=50, max_latency=10)
+        try:
+            first = service.create_customer("John", "Doe", "john.doe@example.com", "+12345678901", "123 Main St")
+            duplicate = service.create_customer("Jane", "Doe", "john.doe@example.com", "+12345678902", "456 Main St")
+            service.flush(timeout=5)
+            customer_id = first["customer_id"].result(timeout=5)
+            with self.assertRaises(Exception) as context:
+                duplicate["customer_id"].result(timeout=5)
+        finally:
+            service.close()
+        self.assertIn("UNIQUE constraint failed", str(context.exception))
+        self.assertEqual(self.db.get_customer(customer_id)[1], "John")
+
+    def test_write_behind_commits_on_exit_without_close(self):
+        """Test that queued writes are committed when the process exits without close()."""
+        code = (
+            "import sys\n"
+            "from crm_CrmService import CrmService\n"
+            "service = CrmService(sys.argv[1], write_behind=True, max_latency=1)\n"
+            "result = service.create_customer('John', 'Doe', 'john.doe@example.com', '+12345678901', '123 Main St')\n"
+            "assert result['status'] == 'queued', result\n"
+        )
+        here = os.path.dirname(os.path.abspath(__file__))
+        result = subprocess.run([sys.executable, "-c", code, os.path.abspath(self.db_file)],
+                                cwd=here, capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.cursor.execute("SELECT first_name FROM customers WHERE email = 'john.doe@example.com'")
+        self.assertEqual(self.cursor.fetchone(), ("John",))
+
+    def test_write_behind_groups_backlog_into_batches(self):
+        """Test that operations queued during a commit are grouped even with max_latency=0."""
+        queue = CrmWriteQueue(self.db_file, max_batch_size=100, max_latency=0)
+        batches = []
+        commit_batch = queue._commit_batch
+        queue._commit_batch = lambda db, batch: (batches.append(len(batch)), commit_batch(db, batch))
+        release = threading.Event()
+        try:
+            blocker = queue.submit(lambda db: release.wait(5))
+            futures = [
+                queue.submit(lambda db, i=i: db.add_customer("John", "Doe", f"john{i}@example.com", None, None, commit=False))
+                for i in range(50)
+            ]
+            release.set()
+            queue.flush(timeout=5)
+            self.assertTrue(blocker.result(timeout=5))
+            self.assertEqual(len({future.result(timeout=5) for future in futures}), 50)
+        finally:
+            queue.close()
+        self.assertLess(len(batches), 51)
+        self.assertLessEqual(len(batches), 3)
+
+    def test_write_behind_writer_failure_closes_queue(self):
+        """Test that a writer that cannot open its database rejects further work."""
+        queue = CrmWriteQueue(os.path.join("missing_directory", "park.db"))
+        queue._writer.join(timeout=5)
+        self.assertFalse(queue._writer.is_alive())
+        with self.assertRaises(RuntimeError):
+            queue.submit(lambda db: None)
+        with self.assertRaises(RuntimeError):
+            queue.flush(timeout=5)
+
     # CrmValidator Tests
     def test_validate_customer_data_success(self):
         """Test validating valid customer data."""
@@ -237,6 +322,12 @@ class TestCrmComponents(unittest.TestCase):
             self.validator.validate_reservation_data(1, 1, "2025-06-05", "2025-06-01")
         self.assertEqual(str(context.exception), "Check-out date must be after check-in date")
 
+    def test_validate_date_range_invalid_format(self):
+        """Test validating a date range that is not in YYYY-MM-DD format."""
+        with self.assertRaises(ValueError) as context:
+            self.validator.validate_date_range("2030-6-01", "2030-06-05")
+        self.assertEqual(str(context.exception), "Dates must be in YYYY-MM-DD format")
+
     def test_validate_payment_data_success(self):
         """Test validating valid payment data."""
         self.validator.validate_payment_data(1, 1, 100.0, "Credit Card")
@@ -248,6 +339,32 @@ class TestCrmComponents(unittest.TestCase):
             self.validator.validate_payment_data(1, 1, 100.0, "Invalid")
         self.assertEqual(str(context.exception), "Invalid payment method")
 
+    # CrmDatabase Schema Check Tests
+    def test_schema_check_missing_tables(self):
+        """Test connecting to a database that lacks the CRM tables."""
+        empty_db_file = "test_empty_park.db"
+        db = CrmDatabase(empty_db_file)
+        try:
+            with self.assertRaises(Exception) as context:
+                db.connect()
+            self.assertIn("missing tables customers", str(context.exception))
+            self.assertIsNone(db.conn)
+        finally:
+            os.remove(empty_db_file)
+
+    # Package Tests
+    def test_package_lazy_import(self):
+        """Test that importing the crm package defers loading its submodules."""
+        code = (
+            "import sys, crm\n"
+            "assert 'crm.crm_CrmService' not in sys.modules\n"
+            "assert crm.CrmService.__name__ == 'CrmService'\n"
+            "assert 'logging' not in sys.modules\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
     # CrmErrorHandler Tests
     def test_handle_error(self):
         """Test error handling and logging."""
@@ -0,0 +1,339 @@
+"""Load-test harness driving mixed CRM traffic against a local SQLite database.
+
+Builds (or reuses) a seeded database, then runs a ramp of request-rate stages
+from --processes worker processes with --threads threads each. Every worker
+draws operations from a weighted mix:
+  - search:      CrmService.get_available_sites for a random stay
+  - book:        search, then CrmService.create_reservation on a returned site
+  - pay:         CrmService.record_payment for an invoice this worker booked
+  - maintenance: AssetReliabilityAnalytics.worst_assets (the dashboard query)
+
+Sends follow a fixed open-loop schedule per stage. Latency is measured from each
+send's scheduled time, not from when the worker got around to it, so a system
+that falls behind shows the queueing delay in its tail instead of hiding it.
+For each stage it reports achieved throughput, p50/p95/p99 latency, the
+p99 start lag (how far sends ran behind schedule), sends dropped because the
+stage ended before they could start, the error rate and the locked-error rate
+("database is locked" errors as a share of all sends). After the run it
+counts double-booking violations (overlapping active reservations on one site).
+Run it repeatedly with different --journal-mode / --write-behind /
+--connections settings to compare them on identical traffic (the mix is
+seeded with --seed).
+
+Usage:
+    python load_test.py --processes 2 --threads 4 --rates 20,50,100 --stage-seconds 10
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+from InitializeSQLiteDatabase import InitializeSQLiteDatabase
+from crm import CrmService
+from maintenance.InitializeMaintenanceDatabase import InitializeMaintenanceDatabase
+from maintenance.AssetReliabilityAnalytics import AssetReliabilityAnalytics
+
+OPERATIONS = ("search", "book", "pay", "maintenance")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="load_test_park.db", help="database file (default: load_test_park.db)")
+    parser.add_argument("--reuse", action="store_true", help="reuse an existing --db instead of rebuilding it")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker process")
+    parser.add_argument("--rates", default="10,25,50", help="comma-separated target requests/second per stage")
+    parser.add_argument("--stage-seconds", type=float, default=10.0, help="duration of each stage")
+    parser.add_argument("--mix", default="search=50,book=20,pay=20,maintenance=10",
+                        help="operation weights, e.g. search=50,book=20,pay=20,maintenance=10")
+    parser.add_argument("--journal-mode", choices=["delete", "wal"], default="delete",
+                        help="SQLite journal mode to set on the database before the run")
+    parser.add_argument("--write-behind", action="store_true",
+                        help="send bookings and payments through one CrmWriteQueue per process")
+    parser.add_argument("--max-batch-size", type=int, default=100, help="write-behind batch size")
+    parser.add_argument("--max-latency", type=float, default=0.01, help="write-behind max batch latency (s)")
+    parser.add_argument("--connections", choices=["per-thread", "per-operation"], default="per-thread",
+                        help="reuse one CrmService per thread for reads, or open and close one for every "
+                             "operation (bookings and payments always reconnect; see Worker)")
+    parser.add_argument("--sites", type=int, default=50, help="RV sites to seed")
+    parser.add_argument("--customers", type=int, default=200, help="customers to seed")
+    parser.add_argument("--assets", type=int, default=40, help="maintenance assets to seed")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for data and traffic")
+    args = parser.parse_args()
+    args.rates = [float(rate) for rate in args.rates.split(",")]
+    if any(rate <= 0 for rate in args.rates):
+        parser.error("--rates must all be positive")
+    args.mix = {name: float(weight) for name, weight in (item.split("=") for item in args.mix.split(","))}
+    unknown = set(args.mix) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return args
+
+def prepare_database(args):
+    """Create and seed the load-test database, then apply the requested journal mode."""
+    if not args.reuse and os.path.exists(args.db):
+        os.remove(args.db)
+    rng = random.Random(args.seed)
+    with redirect_stdout(StringIO()):
+        InitializeSQLiteDatabase(args.db).initialize()
+        InitializeMaintenanceDatabase(args.db).initialize()
+    conn = sqlite3.connect(args.db)
+    cursor = conn.cursor()
+    if not args.reuse:
+        cursor.executemany(
+            "INSERT INTO rv_sites (site_number, site_type, daily_rate) VALUES (?, ?, ?)",
+            [(f"Site{i}", rng.choice(["Full Hookup", "Tent", "Pull-through"]), rng.choice([30.0, 50.0, 60.0]))
+             for i in range(1, args.sites + 1)]
+        )
+        cursor.executemany(
+            "INSERT INTO customers (first_name, last_name, email) VALUES (?, ?, ?)",
+            [("Load", f"Customer{i}", f"load{i}@example.com") for i in range(1, args.customers + 1)]
+        )
+        cursor.execute("INSERT INTO facilities (facility_name, facility_type) VALUES ('Service Area', 'Utility')")
+        facility_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO assets (facility_id, asset_name, asset_type) VALUES (?, ?, ?)",
+            [(facility_id, f"Asset {i}", "Pump") for i in range(1, args.assets + 1)]
+        )
+        for _ in range(args.assets * 5):
+            asset_id = rng.randint(1, args.assets)
+            date = (datetime(2024, 1, 1) + timedelta(days=rng.randint(0, 600))).strftime("%Y-%m-%d")
+            cursor.execute("""
+                INSERT INTO maintenance_requests (asset_id, request_date, priority, status, description)
+                VALUES (?, ?, 'Medium', 'Closed', 'Load test failure')
+            """, (asset_id, date))
+            cursor.execute("""
+                INSERT INTO maintenance_logs (request_id, asset_id, completion_date, performed_by)
+                VALUES (?, ?, ?, 'Load Test')
+            """, (cursor.lastrowid, asset_id, date))
+        conn.commit()
+    cursor.execute(f"PRAGMA journal_mode = {args.journal_mode}").fetchone()
+    conn.close()
+    analytics = AssetReliabilityAnalytics(args.db)
+    analytics.install()
+    analytics.rebuild()
+    analytics.close()
+
+def random_stay(rng):
+    """Return a random future (check_in, check_out) pair of YYYY-MM-DD strings."""
+    check_in = datetime.now() + timedelta(days=rng.randint(1, 120))
+    check_out = check_in + timedelta(days=rng.randint(1, 7))
+    return check_in.strftime("%Y-%m-%d"), check_out.strftime("%Y-%m-%d")
+
+def resolve(result, key):
+    """Return an id from a service result, waiting for it when the write was queued."""
+    value = result[key]
+    return value.result() if hasattr(value, "result") else value
+
+def dropped_sends(next_time, stage_end, rate):
+    """Number of sends scheduled from next_time every 1/rate seconds before stage_end."""
+    if next_time >= stage_end:
+        return 0
+    return math.ceil((stage_end - next_time) * rate)
+
+class Worker:
+    """One load-generating thread.
+
+    With --connections per-thread the worker keeps one CrmService (and its
+    connection) for the whole run; with per-operation it opens and closes a
+    fresh one around every operation, so connection setup is part of latency.
+    Only reads reuse the per-thread connection: the synchronous
+    create_reservation and record_payment close it partway through, so every
+    booking and payment reconnects in both modes. Use --write-behind to keep
+    writes on one long-lived connection.
+    """
+
+    def __init__(self, args, rng, writer, stats, dropped, lock):
+        self.args = args
+        self.rng = rng
+        self.shared_writer = writer
+        self.service = None
+        self.analytics = None
+        if args.connections == "per-thread":
+            self.open()
+        self.stats = stats
+        self.dropped = dropped
+        self.lock = lock
+        self.invoices = []
+        self.names = list(args.mix)
+        self.weights = [args.mix[name] for name in self.names]
+
+    @property
+    def writer(self):
+        return self.shared_writer or self.service
+
+    def open(self):
+        """Open the CRM service and analytics connections this worker reads through."""
+        self.service = CrmService(self.args.db)
+        self.analytics = AssetReliabilityAnalytics(self.args.db)
+
+    def close(self):
+        """Close this worker's connections."""
+        self.service.close()
+        self.analytics.close()
+
+    def run_operation(self, name):
+        """Run one operation; return None on success or the error message."""
+        if name == "book":
+            check_in, check_out = random_stay(self.rng)
+            result = self.service.get_available_sites(check_in, check_out)
+            if result["status"] == "error" or not result["sites"]:
+                return result.get("message")
+            site_id = self.rng.choice(result["sites"])[0]
+            customer_id = self.rng.randint(1, self.args.customers)
+            result = self.writer.create_reservation(customer_id, site_id, check_in, check_out)
+            if result["status"] == "error":
+                return result["message"]
+            self.invoices.append((resolve(result, "invoice_id"), customer_id))
+        elif name == "pay":
+            invoice_id, customer_id = self.invoices.pop()
+            result = self.writer.record_payment(invoice_id, customer_id, 50.0, "Credit Card")
+            if result["status"] == "error":
+                return result["message"]
+            resolve(result, "payment_id")
+        elif name == "search":
+            result = self.service.get_available_sites(*random_stay(self.rng))
+            if result["status"] == "error":
+                return result["message"]
+        else:
+            self.analytics.worst_assets(10)
+        return None
+
+    def run(self, start_time, per_worker_rates):
+        """Issue operations on each stage's fixed schedule until the ramp ends.
+
+        The schedule never resets: if the worker falls behind, later sends
+        start late and that delay counts toward their latency. Sends still
+        waiting when their stage ends are counted as dropped.
+        """
+        per_operation = self.args.connections == "per-operation"
+        for stage, rate in enumerate(per_worker_rates):
+            stage_start = start_time + stage * self.args.stage_seconds
+            stage_end = stage_start + self.args.stage_seconds
+            next_time = stage_start + self.rng.random() / rate
+            while next_time < stage_end:
+                now = time.time()
+                if now >= stage_end:
+                    with self.lock:
+                        self.dropped[stage] += dropped_sends(next_time, stage_end, rate)
+                    break
+                if next_time > now:
+                    time.sleep(next_time - now)
+                name = self.rng.choices(self.names, self.weights)[0]
+                if name == "pay" and not self.invoices:
+                    name = "book"
+                lag = time.time() - next_time
+                try:
+                    if per_operation:
+                        self.open()
+                    try:
+                        error = self.run_operation(name)
+                    finally:
+                        if per_operation:
+                            self.close()
+                except Exception as e:
+                    error = str(e)
+                latency = time.time() - next_time
+                with self.lock:
+                    self.stats.append((stage, name, latency, error, max(lag, 0.0)))
+                next_time += 1.0 / rate
+        if not per_operation:
+            self.close()
+
+def run_process(args, process_index, start_time):
+    """Run --threads workers in this process and return (samples, dropped sends per stage)."""
+    per_worker_rates = [rate / (args.processes * args.threads) for rate in args.rates]
+    writer = None
+    if args.write_behind:
+        writer = CrmService(args.db, write_behind=True,
+                            max_batch_size=args.max_batch_size, max_latency=args.max_latency)
+    stats = []
+    dropped = [0] * len(args.rates)
+    lock = threading.Lock()
+    threads = []
+    for thread_index in range(args.threads):
+        rng = random.Random(args.seed * 1000003 + process_index * 1009 + thread_index)
+        worker = Worker(args, rng, writer, stats, dropped, lock)
+        threads.append(threading.Thread(target=worker.run, args=(start_time, per_worker_rates)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if writer:
+        writer.close()
+    return stats, dropped
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def count_double_bookings(db_file):
+    """Count pairs of active reservations that overlap on the same site."""
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute("""
+            SELECT COUNT(*)
+            FROM reservations r1
+            JOIN reservations r2
+              ON r1.site_id = r2.site_id AND r1.reservation_id < r2.reservation_id
+            WHERE r1.status IN ('Confirmed', 'Checked-in')
+              AND r2.status IN ('Confirmed', 'Checked-in')
+              AND r1.check_in_date < r2.check_out_date
+              AND r2.check_in_date < r1.check_out_date
+        """).fetchone()[0]
+    finally:
+        conn.close()
+
+def report(args, samples, dropped):
+    """Print per-stage and per-operation results."""
+    print(f"processes={args.processes} threads={args.threads} journal_mode={args.journal_mode} "
+          f"write_behind={args.write_behind} connections={args.connections}")
+    print(f"{'stage':<6} {'target/s':>9} {'actual/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'lag p99':>8} {'dropped':>8} {'errors':>7} {'locked':>7}")
+    for stage, rate in enumerate(args.rates):
+        rows = [sample for sample in samples if sample[0] == stage]
+        latencies = sorted(sample[2] for sample in rows)
+        errors = [sample[3] for sample in rows if sample[3]]
+        locked = [error for error in errors if "database is locked" in error]
+        lags = sorted(sample[4] for sample in rows)
+        total = len(rows) or 1
+        print(f"{stage:<6} {rate:>9.1f} {len(rows) / args.stage_seconds:>9.1f} "
+              f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.1f} {percentile(lags, 0.99) * 1000:>8.1f} "
+              f"{dropped[stage]:>8} {len(errors) / total:>7.1%} {len(locked) / total:>7.1%}")
+    print()
+    print(f"{'operation':<12} {'count':>7} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name in OPERATIONS:
+        rows = [sample for sample in samples if sample[1] == name]
+        if not rows:
+            continue
+        latencies = sorted(sample[2] for sample in rows)
+        errors = sum(1 for sample in rows if sample[3])
+        print(f"{name:<12} {len(rows):>7} {percentile(latencies, 0.50) * 1000:>8.1f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.1f} {errors / len(rows):>7.1%}")
+    print()
+    print(f"double-booking violations: {count_double_bookings(args.db)}")
+
+def main():
+    args = parse_args()
+    prepare_database(args)
+    start_time = time.time() + 1.0
+    if args.processes == 1:
+        results = [run_process(args, 0, start_time)]
+    else:
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.starmap(run_process, [(args, index, start_time) for index in range(args.processes)])
+    samples = [sample for stats, _ in results for sample in stats]
+    dropped = [sum(counts) for counts in zip(*(counts for _, counts in results))]
+    report(args, samples, dropped)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import argparse
+import sqlite3
+from sqlite3 import Error
+
+# A log resolves to an asset/facility directly, or through the request or schedule it closes.
+ASSET_EXPR = """COALESCE({row}.asset_id,
+    (SELECT asset_id FROM maintenance_requests WHERE request_id = {row}.request_id),
+    (SELECT asset_id FROM maintenance_schedules WHERE schedule_id = {row}.schedule_id))"""
+FACILITY_EXPR = """COALESCE({row}.facility_id,
+    (SELECT facility_id FROM assets WHERE asset_id = """ + ASSET_EXPR + """),
+    (SELECT facility_id FROM maintenance_requests WHERE request_id = {row}.request_id),
+    (SELECT facility_id FROM maintenance_schedules WHERE schedule_id = {row}.schedule_id))"""
+# Reactive work (closing a maintenance request) counts as a failure; scheduled work does not.
+FAILURE_EXPR = "CASE WHEN {row}.request_id IS NOT NULL THEN 1 ELSE 0 END"
+
+# Logs that could resolve to a given asset/facility, found one resolution path at a
+# time so each branch is an indexed lookup. Candidates are then filtered on the
+# resolved target, so the COALESCE logic is only evaluated for those few rows.
+ASSET_CANDIDATES = """
+    SELECT log_id FROM maintenance_logs WHERE asset_id = {target}
+    UNION SELECT l.log_id FROM maintenance_requests r
+          JOIN maintenance_logs l ON l.request_id = r.request_id WHERE r.asset_id = {target}
+    UNION SELECT l.log_id FROM maintenance_schedules s
+          JOIN maintenance_logs l ON l.schedule_id = s.schedule_id WHERE s.asset_id = {target}"""
+FACILITY_CANDIDATES = """
+    SELECT log_id FROM maintenance_logs WHERE facility_id = {target}
+    UNION SELECT l.log_id FROM assets a
+          JOIN maintenance_logs l ON l.asset_id = a.asset_id WHERE a.facility_id = {target}
+    UNION SELECT l.log_id FROM assets a JOIN maintenance_requests r ON r.asset_id = a.asset_id
+          JOIN maintenance_logs l ON l.request_id = r.request_id WHERE a.facility_id = {target}
+    UNION SELECT l.log_id FROM assets a JOIN maintenance_schedules s ON s.asset_id = a.asset_id
+          JOIN maintenance_logs l ON l.schedule_id = s.schedule_id WHERE a.facility_id = {target}
+    UNION SELECT l.log_id FROM maintenance_requests r
+          JOIN maintenance_logs l ON l.request_id = r.request_id WHERE r.facility_id = {target}
+    UNION SELECT l.log_id FROM maintenance_schedules s
+          JOIN maintenance_logs l ON l.schedule_id = s.schedule_id WHERE s.facility_id = {target}"""
+
+SCOPES = {
+    "asset": ("asset_reliability", "asset_id", ASSET_EXPR, ASSET_CANDIDATES),
+    "facility": ("facility_reliability", "facility_id", FACILITY_EXPR, FACILITY_CANDIDATES),
+}
+
+# Indexes backing each branch of the candidate lookups.
+LOOKUP_INDEXES = {
+    "maintenance_logs": ("asset_id", "request_id", "schedule_id", "facility_id"),
+    "maintenance_requests": ("asset_id", "facility_id"),
+    "maintenance_schedules": ("asset_id", "facility_id"),
+    "assets": ("facility_id",),
+}
+
+# Columns that decide a log's target, failure flag or dates; other edits (e.g. notes) are ignored.
+TRACKED_LOG_COLUMNS = "request_id, schedule_id, facility_id, asset_id, completion_date"
+
+MTBF_DAYS = """CASE WHEN failure_count > 1
+    THEN (julianday(last_failure_date) - julianday(first_failure_date)) / (failure_count - 1)
+END"""
+
+class AssetReliabilityAnalytics:
+    """Running reliability aggregates per asset and per facility.
+
+    asset_reliability and facility_reliability hold failure counts, first/last
+    failure dates, service counts and last service dates. A trigger on
+    maintenance_logs folds each new log into both tables, so dashboards read a
+    handful of rows instead of aggregating the whole log history. When a log
+    is deleted, or one of its tracked columns changes, the counts are
+    decremented for the old target and incremented for the new one. Only the
+    min/max dates of the affected rows are recomputed, from the logs that an
+    indexed lookup finds for that asset or facility. rebuild() recomputes
+    everything, e.g. after install or after requests are reassigned to
+    different assets.
+
+    Mean time between failures is derived as the span between the first and
+    last failure divided by the number of intervals, which can be maintained
+    exactly from the running min/max dates and count.
+    """
+
+    def __init__(self, db_file="park.db"):
+        self.db_file = db_file
+        self.conn = None
+        self.cursor = None
+
+    def connect(self):
+        """Establish a connection to the SQLite database if not already set."""
+        if self.conn is None or self.cursor is None:
+            try:
+                self.conn = sqlite3.connect(self.db_file)
+                self.cursor = self.conn.cursor()
+            except Error as e:
+                raise Exception(f"Database connection failed: {e}")
+
+    def close(self):
+        """Close the database connection if it exists."""
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def install(self):
+        """Create the aggregate tables, resolution view and maintenance_logs triggers."""
+        try:
+            self.connect()
+            for table, columns in LOOKUP_INDEXES.items():
+                for column in columns:
+                    self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})")
+
+            for table, key, _, _ in SCOPES.values():
+                self.cursor.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        {key} INTEGER PRIMARY KEY,
+                        failure_count INTEGER NOT NULL DEFAULT 0,
+                        first_failure_date DATE,
+                        last_failure_date DATE,
+                        service_count INTEGER NOT NULL DEFAULT 0,
+                        last_service_date DATE
+                    )
+                """)
+                self.cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table}_failures
+                    ON {table} (failure_count DESC, last_failure_date DESC)
+                """)
+
+            self.cursor.execute("DROP VIEW IF EXISTS maintenance_log_targets")
+            self.cursor.execute(f"""
+                CREATE VIEW maintenance_log_targets AS
+                SELECT l.log_id,
+                       {ASSET_EXPR.format(row="l")} AS asset_id,
+                       {FACILITY_EXPR.format(row="l")} AS facility_id,
+                       {FAILURE_EXPR.format(row="l")} AS is_failure,
+                       l.completion_date
+                FROM maintenance_logs l
+            """)
+
+            for scope, (table, key, expr, candidates) in SCOPES.items():
+                old_target = expr.format(row="OLD")
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS reliability_{scope}_insert")
+                self.cursor.execute(f"""
+                    CREATE TRIGGER reliability_{scope}_insert AFTER INSERT ON maintenance_logs
+                    BEGIN
+                        {self._upsert_sql(table, key, expr.format(row="NEW"), FAILURE_EXPR.format(row="NEW"))}
+                    END
+                """)
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS reliability_{scope}_update")
+                self.cursor.execute(f"""
+                    CREATE TRIGGER reliability_{scope}_update
+                    AFTER UPDATE OF {TRACKED_LOG_COLUMNS} ON maintenance_logs
+                    BEGIN
+                        {self._retract_sql(table, key, old_target, FAILURE_EXPR.format(row="OLD"))}
+                        {self._refresh_dates_sql(table, key, old_target, candidates)}
+                        {self._upsert_sql(table, key, expr.format(row="NEW"), FAILURE_EXPR.format(row="NEW"))}
+                    END
+                """)
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS reliability_{scope}_delete")
+                self.cursor.execute(f"""
+                    CREATE TRIGGER reliability_{scope}_delete AFTER DELETE ON maintenance_logs
+                    BEGIN
+                        {self._retract_sql(table, key, old_target, FAILURE_EXPR.format(row="OLD"))}
+                        {self._refresh_dates_sql(table, key, old_target, candidates)}
+                    END
+                """)
+            self.conn.commit()
+        except Error as e:
+            raise Exception(f"Failed to install reliability analytics: {e}")
+
+    def _upsert_sql(self, table, key, target, is_failure):
+        """Fold one new log into a running aggregate row."""
+        return f"""
+            INSERT INTO {table} ({key}, failure_count, first_failure_date, last_failure_date,
+                                 service_count, last_service_date)
+            SELECT target, {is_failure},
+                   CASE WHEN {is_failure} = 1 THEN NEW.completion_date END,
+                   CASE WHEN {is_failure} = 1 THEN NEW.completion_date END,
+                   1, NEW.completion_date
+            FROM (SELECT {target} AS target)
+            WHERE target IS NOT NULL
+            ON CONFLICT({key}) DO UPDATE SET
+                failure_count = failure_count + excluded.failure_count,
+                first_failure_date = MIN(COALESCE(first_failure_date, excluded.first_failure_date),
+                                         COALESCE(excluded.first_failure_date, first_failure_date)),
+                last_failure_date = MAX(COALESCE(last_failure_date, excluded.last_failure_date),
+                                        COALESCE(excluded.last_failure_date, last_failure_date)),
+                service_count = service_count + 1,
+                last_service_date = MAX(COALESCE(last_service_date, excluded.last_service_date),
+                                        excluded.last_service_date);
+        """
+
+    def _retract_sql(self, table, key, target, is_failure):
+        """Take one log's counts out of its old aggregate row, dropping rows left with no logs."""
+        return f"""
+            UPDATE {table}
+            SET failure_count = failure_count - {is_failure}, service_count = service_count - 1
+            WHERE {key} = {target};
+            DELETE FROM {table} WHERE {key} = {target} AND service_count <= 0;
+        """
+
+    def _refresh_dates_sql(self, table, key, target, candidates):
+        """Recompute the min/max dates of one aggregate row from that target's logs only."""
+        return f"""
+            UPDATE {table}
+            SET (first_failure_date, last_failure_date, last_service_date) = (
+                SELECT MIN(CASE WHEN is_failure = 1 THEN completion_date END),
+                       MAX(CASE WHEN is_failure = 1 THEN completion_date END),
+                       MAX(completion_date)
+                FROM maintenance_log_targets
+                WHERE log_id IN ({candidates.format(target=target)})
+                AND {key} = {target}
+            )
+            WHERE {key} = {target};
+        """
+
+    def rebuild(self):
+        """Recompute every aggregate row from the full maintenance log history."""
+        try:
+            self.connect()
+            for table, key, _, _ in SCOPES.values():
+                self.cursor.execute(f"DELETE FROM {table}")
+                self.cursor.execute(f"""
+                    INSERT INTO {table} ({key}, failure_count, first_failure_date, last_failure_date,
+                                         service_count, last_service_date)
+                    SELECT {key}, SUM(is_failure),
+                           MIN(CASE WHEN is_failure = 1 THEN completion_date END),
+                           MAX(CASE WHEN is_failure = 1 THEN completion_date END),
+                           COUNT(*), MAX(completion_date)
+                    FROM maintenance_log_targets
+                    WHERE {key} IS NOT NULL
+                    GROUP BY {key}
+                """)
+            self.conn.commit()
+        except Error as e:
+            raise Exception(f"Failed to rebuild reliability analytics: {e}")
+
+    def worst_assets(self, limit=10):
+        """Return the assets with the most failures, shortest MTBF first among ties."""
+        try:
+            self.connect()
+            self.cursor.execute(f"""
+                SELECT r.asset_id, a.asset_name, a.facility_id, r.failure_count,
+                       {MTBF_DAYS} AS mtbf_days, r.last_failure_date, r.last_service_date
+                FROM asset_reliability r
+                JOIN assets a ON a.asset_id = r.asset_id
+                WHERE r.failure_count > 0
+                ORDER BY r.failure_count DESC, mtbf_days IS NULL, mtbf_days, r.last_failure_date DESC
+                LIMIT ?
+            """, (limit,))
+            return self.cursor.fetchall()
+        except Error as e:
+            raise Exception(f"Failed to retrieve worst assets: {e}")
+
+    def get_asset_reliability(self, asset_id):
+        """Return (failure_count, mtbf_days, last_failure_date, last_service_date) for an asset."""
+        try:
+            self.connect()
+            self.cursor.execute(f"""
+                SELECT failure_count, {MTBF_DAYS}, last_failure_date, last_service_date
+                FROM asset_reliability WHERE asset_id = ?
+            """, (asset_id,))
+            return self.cursor.fetchone()
+        except Error as e:
+            raise Exception(f"Failed to retrieve asset reliability: {e}")
+
+    def get_facility_reliability(self):
+        """Return per-facility aggregates, most failures first."""
+        try:
+            self.connect()
+            self.cursor.execute(f"""
+                SELECT r.facility_id, f.facility_name, r.failure_count, {MTBF_DAYS} AS mtbf_days,
+                       r.last_failure_date, r.last_service_date
+                FROM facility_reliability r
+                JOIN facilities f ON f.facility_id = r.facility_id
+                ORDER BY r.failure_count DESC, r.facility_id
+            """)
+            return self.cursor.fetchall()
+        except Error as e:
+            raise Exception(f"Failed to retrieve facility reliability: {e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asset reliability analytics for park.db")
+    parser.add_argument("command", choices=["install", "rebuild", "worst"],
+                        help="install tables/triggers (and rebuild), rebuild aggregates, or list worst assets")
+    parser.add_argument("--db", default="park.db", help="database file (default: park.db)")
+    parser.add_argument("--limit", type=int, default=10, help="number of assets for 'worst'")
+    args = parser.parse_args()
+
+    analytics = AssetReliabilityAnalytics(args.db)
+    try:
+        if args.command == "install":
+            analytics.install()
+            analytics.rebuild()
+            print("Reliability analytics installed and rebuilt.")
+        elif args.command == "rebuild":
+            analytics.rebuild()
+            print("Reliability aggregates rebuilt.")
+        else:
+            for row in analytics.worst_assets(args.limit):
+                print(row)
+    finally:
+        analytics.close()
@@ -0,0 +1,140 @@
+import unittest
+import sqlite3
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+from InitializeMaintenanceDatabase import InitializeMaintenanceDatabase
+from AssetReliabilityAnalytics import AssetReliabilityAnalytics, SCOPES
+
+class TestMaintenanceComponents(unittest.TestCase):
+    def setUp(self):
+        """Create a file-based maintenance database with reliability analytics installed."""
+        self.db_file = "test_maintenance_park.db"
+        with redirect_stdout(StringIO()):
+            InitializeMaintenanceDatabase(self.db_file).initialize()
+        self.conn = sqlite3.connect(self.db_file)
+        self.cursor = self.conn.cursor()
+        self.cursor.execute("INSERT INTO facilities (facility_name, facility_type) VALUES ('Laundry', 'Laundry Room')")
+        self.facility_id = self.cursor.lastrowid
+        self.cursor.executemany(
+            "INSERT INTO assets (facility_id, asset_name, asset_type) VALUES (?, ?, ?)",
+            [(self.facility_id, "Washer 1", "Washer"), (self.facility_id, "Dryer 1", "Dryer")]
+        )
+        self.conn.commit()
+        self.analytics = AssetReliabilityAnalytics(self.db_file)
+        self.analytics.install()
+
+    def tearDown(self):
+        """Close connections and remove the test database file."""
+        self.analytics.close()
+        self.conn.close()
+        if os.path.exists(self.db_file):
+            os.remove(self.db_file)
+
+    def log_failure(self, asset_id, date):
+        """Record a maintenance request for an asset and the log closing it."""
+        self.cursor.execute("""
+            INSERT INTO maintenance_requests (asset_id, request_date, priority, status, description)
+            VALUES (?, ?, 'High', 'Closed', 'Broken')
+        """, (asset_id, date))
+        self.cursor.execute("""
+            INSERT INTO maintenance_logs (request_id, asset_id, completion_date, performed_by)
+            VALUES (?, ?, ?, 'Tech')
+        """, (self.cursor.lastrowid, asset_id, date))
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def log_service(self, asset_id, date):
+        """Record routine (non-failure) maintenance on an asset."""
+        self.cursor.execute("""
+            INSERT INTO maintenance_logs (asset_id, completion_date, performed_by)
+            VALUES (?, ?, 'Tech')
+        """, (asset_id, date))
+        self.conn.commit()
+
+    def test_incremental_aggregates(self):
+        """Test that each new log updates failure count, MTBF and last service date."""
+        self.log_failure(1, "2025-01-01")
+        self.log_failure(1, "2025-01-21")
+        self.log_failure(1, "2025-01-11")
+        self.log_service(1, "2025-02-01")
+        failure_count, mtbf_days, last_failure, last_service = self.analytics.get_asset_reliability(1)
+        self.assertEqual(failure_count, 3)
+        self.assertAlmostEqual(mtbf_days, 10.0)
+        self.assertEqual(last_failure, "2025-01-21")
+        self.assertEqual(last_service, "2025-02-01")
+
+    def test_facility_aggregates_resolve_through_assets(self):
+        """Test that logs recorded against an asset roll up to its facility."""
+        self.log_failure(1, "2025-01-01")
+        self.log_failure(2, "2025-01-05")
+        facilities = self.analytics.get_facility_reliability()
+        self.assertEqual(len(facilities), 1)
+        self.assertEqual(facilities[0][0], self.facility_id)
+        self.assertEqual(facilities[0][2], 2)
+
+    def test_worst_assets(self):
+        """Test that worst assets are ranked by failure count."""
+        self.log_failure(2, "2025-01-01")
+        self.log_failure(2, "2025-01-03")
+        self.log_failure(1, "2025-01-02")
+        self.log_service(1, "2025-01-04")
+        worst = self.analytics.worst_assets(limit=1)
+        self.assertEqual(len(worst), 1)
+        self.assertEqual(worst[0][1], "Dryer 1")
+        self.assertEqual(worst[0][3], 2)
+
+    def test_delete_recomputes_affected_asset(self):
+        """Test that deleting a log recomputes its asset's aggregates."""
+        self.log_failure(1, "2025-01-01")
+        log_id = self.log_failure(1, "2025-01-09")
+        self.cursor.execute("DELETE FROM maintenance_logs WHERE log_id = ?", (log_id,))
+        self.conn.commit()
+        self.assertEqual(self.analytics.get_asset_reliability(1), (1, None, "2025-01-01", "2025-01-01"))
+
+    def test_notes_update_skips_aggregates(self):
+        """Test that editing only a log's notes neither changes nor recomputes the aggregates."""
+        log_id = self.log_failure(1, "2025-01-01")
+        before = (self.analytics.get_asset_reliability(1), self.analytics.get_facility_reliability())
+        # A sentinel that any recompute of this row would overwrite
+        self.cursor.execute("UPDATE asset_reliability SET last_service_date = '1999-01-01' WHERE asset_id = 1")
+        self.cursor.execute("UPDATE maintenance_logs SET notes = 'Replaced belt' WHERE log_id = ?", (log_id,))
+        self.conn.commit()
+        self.assertEqual(self.analytics.get_asset_reliability(1)[3], "1999-01-01")
+        self.cursor.execute("UPDATE asset_reliability SET last_service_date = '2025-01-01' WHERE asset_id = 1")
+        self.conn.commit()
+        self.assertEqual((self.analytics.get_asset_reliability(1), self.analytics.get_facility_reliability()), before)
+
+    def test_update_moves_log_between_assets(self):
+        """Test that reassigning a log decrements its old asset and increments its new one."""
+        self.log_failure(1, "2025-01-01")
+        log_id = self.log_failure(1, "2025-01-09")
+        self.cursor.execute("UPDATE maintenance_requests SET asset_id = 2 WHERE request_id = "
+                            "(SELECT request_id FROM maintenance_logs WHERE log_id = ?)", (log_id,))
+        self.cursor.execute("UPDATE maintenance_logs SET asset_id = 2 WHERE log_id = ?", (log_id,))
+        self.conn.commit()
+        self.assertEqual(self.analytics.get_asset_reliability(1), (1, None, "2025-01-01", "2025-01-01"))
+        self.assertEqual(self.analytics.get_asset_reliability(2), (1, None, "2025-01-09", "2025-01-09"))
+        self.assertEqual(self.analytics.get_facility_reliability()[0][2], 2)
+
+    def test_date_refresh_uses_indexes(self):
+        """Test that refreshing an aggregate row's dates never scans the log history."""
+        for table, key, _, candidates in SCOPES.values():
+            sql = self.analytics._refresh_dates_sql(table, key, "1", candidates).strip().rstrip(";")
+            plan = [row[-1] for row in self.cursor.execute("EXPLAIN QUERY PLAN " + sql)]
+            self.assertFalse([step for step in plan if step.startswith("SCAN")], plan)
+
+    def test_rebuild_matches_incremental(self):
+        """Test that a full rebuild reproduces the incrementally maintained aggregates."""
+        self.log_failure(1, "2025-01-01")
+        self.log_failure(1, "2025-01-07")
+        self.log_service(2, "2025-01-03")
+        incremental = (self.analytics.get_asset_reliability(1), self.analytics.get_asset_reliability(2),
+                       self.analytics.get_facility_reliability())
+        self.analytics.rebuild()
+        rebuilt = (self.analytics.get_asset_reliability(1), self.analytics.get_asset_reliability(2),
+                   self.analytics.get_facility_reliability())
+        self.assertEqual(incremental, rebuilt)
+
+if __name__ == '__main__':
+    unittest.main()
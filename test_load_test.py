@@ -0,0 +1,35 @@
+import unittest
+from load_test import dropped_sends, percentile
+
+class TestLoadTest(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        """Test that percentiles pick the nearest-rank sample without interpolating."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 1.0), 100)
+        self.assertEqual(percentile([1, 2, 3, 4], 0.50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 0.51), 3)
+
+    def test_percentile_edges(self):
+        """Test percentiles of empty and single-value samples."""
+        self.assertEqual(percentile([], 0.99), 0.0)
+        self.assertEqual(percentile([7], 0.0), 7)
+        self.assertEqual(percentile([7], 0.99), 7)
+
+    def test_dropped_sends(self):
+        """Test counting scheduled sends that never started before the stage ended."""
+        self.assertEqual(dropped_sends(0.0, 1.0, 2.0), 2)
+        self.assertEqual(dropped_sends(0.1, 1.0, 2.0), 2)
+        self.assertEqual(dropped_sends(0.5, 1.0, 2.0), 1)
+        self.assertEqual(dropped_sends(0.9, 1.0, 2.0), 1)
+        self.assertEqual(dropped_sends(100.0, 110.0, 5.0), 50)
+
+    def test_dropped_sends_after_stage_end(self):
+        """Test that a schedule already past the stage end drops nothing."""
+        self.assertEqual(dropped_sends(1.0, 1.0, 2.0), 0)
+        self.assertEqual(dropped_sends(1.5, 1.0, 2.0), 0)
+
+if __name__ == '__main__':
+    unittest.main()